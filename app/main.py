@@ -1,28 +1,60 @@
 """Main FastAPI application."""
 
+import atexit
+import json
 import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
 
+import orjson
 import structlog
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import Response
-from fastapi.responses import JSONResponse
-from typing import Callable, cast
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Any, Callable, cast
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
 
 from app.routers import api
 from app.utils.web3_client import web3_client
 from app.settings import settings
 
+log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
+
+# Stdout handler owned by a background listener thread so request
+# coroutines only enqueue records instead of blocking on stdout writes
+stdout_handler = logging.StreamHandler(sys.stdout)
+stdout_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+)
+log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, stdout_handler)
+# Started once per process, not per app, so every lifespan shares it
+log_listener.start()
+atexit.register(log_listener.stop)
+
 # Configure stdlib logging so INFO logs surface before structlog wraps them
 logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper(), logging.INFO),
-    format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    level=log_level,
+    format="%(message)s",
+    handlers=[QueueHandler(log_queue)],
 )
 
+
+def _orjson_dumps(obj: object, default: Callable[[object], object]) -> str:
+    """Serialize log events with orjson, decoded for the stdlib handlers."""
+    try:
+        return orjson.dumps(obj, default=default).decode()
+    except TypeError:
+        # orjson rejects ints beyond 64 bits, which wei amounts often are
+        return json.dumps(obj, default=default)
+
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -30,18 +62,17 @@ structlog.configure(
         structlog.stdlib.add_log_level,
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps),
     ],
     context_class=dict,
+    # Drop calls below the configured level before any processor runs
+    wrapper_class=structlog.make_filtering_bound_logger(log_level),
     logger_factory=structlog.stdlib.LoggerFactory(),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger(__name__)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -61,49 +92,51 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down application")
+    await web3_client.wait_for_receipts()
 
 
-# Create FastAPI application
-app = FastAPI(
-    title="Blockchain Banking API",
-    lifespan=lifespan,
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json",
-)
+class WeiJSONResponse(ORJSONResponse):
+    """ORJSONResponse that renders ints beyond 64 bits with the stdlib."""
 
-# Add rate limiting
-app.state.limiter = limiter
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            # Wei amounts are uint256, orjson only handles 64-bit ints
+            return JSONResponse.render(self, content)
 
 
-def rate_limit_handler(request: Request, exc: RateLimitExceeded) -> Response:
-    """Proxy handler to satisfy typing for SlowAPI rate limit errors."""
+# Error bodies serialized once; handlers only copy the bytes
+_RATE_LIMITED_BODY = orjson.dumps({"detail": "Too Many Requests"})
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+# Sent when the exceeded limit is unknown
+_DEFAULT_RETRY_AFTER = "60"
 
-    return _rate_limit_exceeded_handler(request, exc)
 
+def rate_limit_handler(request: Request, exc: RateLimitExceeded) -> Response:
+    """Return a pre-serialized 429 response for SlowAPI rate limit errors."""
 
-app.add_exception_handler(
-    RateLimitExceeded,
-    cast("Callable[[Request, Exception], Response]", rate_limit_handler),
-)
+    retry_after = _DEFAULT_RETRY_AFTER
+    if exc.limit is not None:
+        retry_after = str(exc.limit.limit.get_expiry())
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    return Response(
+        content=_RATE_LIMITED_BODY,
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        media_type="application/json",
+        headers={"Retry-After": retry_after},
+    )
 
 
-@app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all HTTP requests."""
+    method = request.method
+    url = str(request.url)
+
     logger.info(
         "HTTP request",
-        method=request.method,
-        url=str(request.url),
+        method=method,
+        url=url,
         client=request.client.host if request.client else None,
     )
 
@@ -111,15 +144,14 @@ async def log_requests(request: Request, call_next):
 
     logger.info(
         "HTTP response",
-        method=request.method,
-        url=str(request.url),
+        method=method,
+        url=url,
         status_code=response.status_code,
     )
 
     return response
 
 
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
     logger.error(
@@ -130,22 +162,79 @@ async def global_exception_handler(request: Request, exc: Exception):
         exc_info=True,
     )
 
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"detail": "Internal server error", "error": str(exc)},
+        media_type="application/json",
     )
 
 
-# Include routers
-app.include_router(api.router, prefix="/api")
-
-
-@app.get("/", tags=["Health"])
 async def health_check() -> dict[str, str]:
     """Basic health check endpoint."""
     return {"status": "healthy"}
 
 
+def create_app(
+    default_limits: list[str | Callable[..., str]] | None = None,
+) -> FastAPI:
+    """
+    Build a fully configured FastAPI application.
+
+    Args:
+        default_limits: Per-client rate limits applied to every route
+            except the health check; defaults to settings.rate_limit_default
+    """
+    app = FastAPI(
+        title="Blockchain Banking API",
+        lifespan=lifespan,
+        default_response_class=WeiJSONResponse,
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        openapi_url="/api/openapi.json",
+    )
+
+    # Add rate limiting, shared across workers when backed by Redis. If
+    # Redis is unreachable, limits are counted per worker in memory rather
+    # than failing every request
+    if default_limits is None:
+        default_limits = [settings.rate_limit_default]
+    limiter = Limiter(
+        key_func=get_remote_address,
+        default_limits=default_limits,
+        storage_uri=settings.rate_limit_storage_uri,
+        strategy="moving-window",
+        in_memory_fallback_enabled=True,
+    )
+    limiter.exempt(health_check)
+    app.state.limiter = limiter
+    app.add_middleware(SlowAPIMiddleware)
+    app.add_exception_handler(
+        RateLimitExceeded,
+        cast("Callable[[Request, Exception], Response]", rate_limit_handler),
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.middleware("http")(log_requests)
+    app.add_exception_handler(Exception, global_exception_handler)
+
+    # Include routers
+    app.include_router(api.router, prefix="/api")
+    app.get("/", tags=["Health"])(health_check)
+
+    return app
+
+
+# Create FastAPI application
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -153,6 +242,9 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.app_host,
         port=settings.app_port,
-        reload=True,
+        reload=settings.app_reload,
+        workers=settings.app_workers,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.log_level.lower(),
     )
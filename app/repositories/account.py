@@ -6,13 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.utils.web3_client import web3_client
 from app.utils.crypto import encrypt_private_key, decrypt_private_key
-from app.settings import settings
+from app.settings import INITIAL_FAUCET_WEI, settings
 from app.repositories.exceptions import (
     AccountAlreadyExistsError,
     AccountNotFoundError,
     InsufficientBalanceError,
     BlockchainError,
+    TransactionNotFoundError,
 )
+from app.schemas.blockchain import TransactionStatus
 from app.schemas.user import UserResponse
 import structlog
 
@@ -48,7 +50,6 @@ class AccountRepository:
 
         self.db.add(user)
         await self.db.commit()
-        await self.db.refresh(user)
         faucet_tx_hash = await self.get_initial_fund(name, user)
 
         return UserResponse(
@@ -59,9 +60,9 @@ class AccountRepository:
         )
 
     async def get_user_by_name(self, name: str) -> User:
-
-        result = await self.db.execute(select(User).where(User.name == name))
-        user = result.scalar_one_or_none()
+        # Primary key lookup served from the session identity map when the
+        # user was already loaded during this request
+        user = await self.db.get(User, name)
 
         if not user:
             logger.warning("Account not found", name=name)
@@ -69,20 +70,50 @@ class AccountRepository:
 
         return user
 
-    async def get_balance(self, name: str, token_address: str) -> int:
-        user = await self.get_user_by_name(name)
+    async def get_users_by_names(self, names: list[str]) -> dict[str, User]:
+        result = await self.db.execute(
+            select(User).where(User.name.in_(names))
+        )
+        users = {user.name: user for user in result.scalars()}
+
+        for name in names:
+            if name not in users:
+                logger.warning("Account not found", name=name)
+                raise AccountNotFoundError(f"Account '{name}' not found")
+
+        return users
+
+    async def get_address(self, name: str) -> str:
+        # Select only the address column; callers here never need the key
+        result = await self.db.execute(
+            select(User.address).where(User.name == name)
+        )
+        address = result.scalar_one_or_none()
+
+        if address is None:
+            logger.warning("Account not found", name=name)
+            raise AccountNotFoundError(f"Account '{name}' not found")
+
+        return address
 
+    async def get_balance(
+        self, address: str, token_address: str
+    ) -> tuple[int, bool]:
         try:
-            return await web3_client.get_balance(user.address, token_address)
+            return await web3_client.get_cached_balance(
+                address, token_address
+            )
         except Exception as e:
             raise BlockchainError(f"Failed to get balance: {str(e)}")
 
     async def transfer_from_to(
-        self, from_name: str, to_name: str, amount: int, token_address: str
+        self,
+        from_user: User,
+        to_user: User,
+        amount: int,
+        token_address: str,
+        wait: bool = False,
     ) -> str:
-        from_user = await self.get_user_by_name(from_name)
-        to_user = await self.get_user_by_name(to_name)
-
         try:
             balance = await web3_client.get_balance(
                 from_user.address, token_address
@@ -104,23 +135,35 @@ class AccountRepository:
             to_address=to_user.address,
             amount=amount,
             token_address=token_address,
+            wait=wait,
         )
 
+    async def get_transaction_status(self, tx_hash: str) -> TransactionStatus:
+        try:
+            tx_status = await web3_client.get_transaction_status(tx_hash)
+        except Exception as e:
+            raise BlockchainError(
+                f"Failed to get transaction status: {str(e)}"
+            )
+
+        if tx_status is None:
+            raise TransactionNotFoundError(
+                f"Transaction '{tx_hash}' not found"
+            )
+
+        return tx_status
+
     async def get_initial_fund(
         self, name: str, user: User | None = None
     ) -> str:
         if user is None:
             user = await self.get_user_by_name(name)
 
-        amount_wei = web3_client.w3.to_wei(
-            settings.initial_faucet_gwei, "gwei"
-        )
-
         try:
             return await web3_client.send_native_token(
                 from_private_key=settings.faucet_private_key,
                 to_address=user.address,
-                amount_wei=amount_wei,
+                amount_wei=INITIAL_FAUCET_WEI,
             )
         except Exception as e:
             logger.error("Faucet funding failed", name=name, error=str(e))
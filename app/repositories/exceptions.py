@@ -25,6 +25,12 @@ class BlockchainError(Exception):
     pass
 
 
+class TransactionNotFoundError(Exception):
+    """Raised when a transaction hash is unknown to the blockchain node."""
+
+    pass
+
+
 class InvalidAddressError(Exception):
     """Raised when an Ethereum address is invalid."""
 
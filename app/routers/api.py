@@ -1,6 +1,6 @@
 """API routes for blockchain banking operations."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -10,6 +10,7 @@ from app.repositories.exceptions import (
     AccountNotFoundError,
     InsufficientBalanceError,
     BlockchainError,
+    TransactionNotFoundError,
 )
 from app.schemas.user import (
     UserCreate,
@@ -17,6 +18,7 @@ from app.schemas.user import (
     BalanceResponse,
     TransferRequest,
     TransferResponse,
+    TransactionStatusResponse,
 )
 from app.schemas.blockchain import Tokens, token_address_mapping
 import structlog
@@ -46,16 +48,21 @@ async def create_account(
 
 @router.get("/get_balance", response_model=BalanceResponse)
 async def get_balance(
-    name: str, token: Tokens, db: AsyncSession = Depends(get_db)
+    name: str,
+    token: Tokens,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
 ) -> BalanceResponse:
     try:
         repo = AccountRepository(db)
-        user = await repo.get_user_by_name(name)
+        address = await repo.get_address(name)
         token_address = token_address_mapping(token)
-        balance = await repo.get_balance(name, token_address)
-        return BalanceResponse(
+        balance, stale = await repo.get_balance(address, token_address)
+        if stale:
+            response.headers["X-Stale"] = "1"
+        return BalanceResponse.model_construct(
             name=name,
-            address=user.address,
+            address=address,
             token=token,
             token_address=token_address,
             balance=balance,
@@ -78,29 +85,36 @@ async def get_balance(
 
 @router.post("/transfer", response_model=TransferResponse)
 async def transfer(
-    transfer_data: TransferRequest, db: AsyncSession = Depends(get_db)
+    transfer_data: TransferRequest,
+    wait: bool = False,
+    db: AsyncSession = Depends(get_db),
 ) -> TransferResponse:
+    """Submit a transfer; pass ``wait=true`` to block until it is mined."""
     try:
         repo = AccountRepository(db)
 
-        from_user = await repo.get_user_by_name(transfer_data.from_name)
-        to_user = await repo.get_user_by_name(transfer_data.to_name)
+        users = await repo.get_users_by_names(
+            [transfer_data.from_name, transfer_data.to_name]
+        )
+        from_user = users[transfer_data.from_name]
+        to_user = users[transfer_data.to_name]
 
         tx_hash = await repo.transfer_from_to(
-            from_name=transfer_data.from_name,
-            to_name=transfer_data.to_name,
+            from_user=from_user,
+            to_user=to_user,
             amount=transfer_data.amount,
             token_address=token_address_mapping(transfer_data.token),
+            wait=wait,
         )
 
-        return TransferResponse(
+        return TransferResponse.model_construct(
             success=True,
             tx_hash=tx_hash,
             from_address=from_user.address,
             to_address=to_user.address,
             amount=transfer_data.amount,
             token=transfer_data.token,
-            message="Transfer successful",
+            message="Transfer successful" if wait else "Transfer submitted",
         )
     except AccountNotFoundError as e:
         raise HTTPException(
@@ -110,3 +124,24 @@ async def transfer(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
         )
+
+
+@router.get("/tx/{tx_hash}", response_model=TransactionStatusResponse)
+async def get_transaction_status(
+    tx_hash: str = Path(..., pattern=r"^0x[0-9a-fA-F]{64}$"),
+    db: AsyncSession = Depends(get_db),
+) -> TransactionStatusResponse:
+    try:
+        repo = AccountRepository(db)
+        tx_status = await repo.get_transaction_status(tx_hash)
+        return TransactionStatusResponse.model_construct(
+            tx_hash=tx_hash, status=tx_status
+        )
+    except TransactionNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    except BlockchainError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
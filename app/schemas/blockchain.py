@@ -2,6 +2,7 @@
 
 from enum import StrEnum
 from pydantic import BaseModel, Field, field_validator
+from web3 import Web3
 
 
 class BlockchainAccount(BaseModel):
@@ -33,7 +34,19 @@ class Tokens(StrEnum):
     USDC = "USDC"
 
 
+class TransactionStatus(StrEnum):
+    PENDING = "pending"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+
+# Checksummed once at import rather than rebuilt per lookup
+_TOKEN_ADDRESSES: dict[Tokens, str] = {
+    Tokens.USDC: Web3.to_checksum_address(
+        "0x72325eCDD02Db5af242DCBfDD2fC3C5E232c8e9E"
+    ),
+}
+
+
 def token_address_mapping(token: Tokens) -> str:
-    return {
-        Tokens.USDC: "0x72325eCDD02Db5af242DCBfDD2fC3C5E232c8e9E",
-    }[token]
+    return _TOKEN_ADDRESSES[token]
@@ -1,8 +1,14 @@
 """Pydantic schemas for request/response validation."""
 
+import re
+
 from pydantic import BaseModel, Field, field_validator
 
-from app.schemas.blockchain import Tokens
+from app.schemas.blockchain import Tokens, TransactionStatus
+
+# ASCII letters, digits, - and _, with at least one letter or digit. The
+# leading run excludes letters and digits so matching never backtracks
+_NAME_RE = re.compile(r"[_-]*[A-Za-z0-9][A-Za-z0-9_-]*")
 
 
 class UserCreate(BaseModel):
@@ -15,8 +21,8 @@ class UserCreate(BaseModel):
     @field_validator("name")
     @classmethod
     def validate_name(cls, v: str) -> str:
-        """Validate username contains only alphanumeric and underscores."""
-        if not v.replace("_", "").replace("-", "").isalnum():
+        """Validate username contains only ASCII alphanumerics, - and _."""
+        if not _NAME_RE.fullmatch(v):
             raise ValueError(
                 "Name must contain only alphanumeric characters, "
                 "hyphens, and underscores"
@@ -75,6 +81,13 @@ class TransferResponse(BaseModel):
     message: str | None = None
 
 
+class TransactionStatusResponse(BaseModel):
+    """Schema for transaction status response."""
+
+    tx_hash: str
+    status: TransactionStatus
+
+
 class ErrorResponse(BaseModel):
     """Schema for error responses."""
 
@@ -3,6 +3,7 @@
 from decimal import Decimal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from web3.types import Wei
 
 
 class Settings(BaseSettings):
@@ -10,6 +11,10 @@ class Settings(BaseSettings):
 
     # Database Configuration
     database_url: str
+    # Per worker; the production entrypoint sizes its worker count so
+    # workers * (pool + overflow) fits the server's max_connections
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
 
     # Blockchain Configuration
     rpc_url: str
@@ -21,13 +26,23 @@ class Settings(BaseSettings):
     # API Configuration
     app_host: str = "0.0.0.0"
     app_port: int = 8000
+    app_workers: int = 1
+    app_reload: bool = False
     log_level: str = "INFO"
 
+    # Rate Limiting Configuration
+    # SlowAPI's Redis storage is synchronous: one blocking round trip per
+    # request on the event loop
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_default: str = "100/minute"
+
     # Chain Configuration
     chain_id: int = 1000
     gas_limit: int = 100000
     gas_price_gwei: Decimal = Decimal("0.1")
     initial_faucet_gwei: Decimal = Decimal("10")
+    balance_cache_ttl: float = 3.0
+    balance_cache_size: int = 10000
 
     # ERC20 ABI
     erc20_abi: list = [
@@ -60,3 +75,7 @@ class Settings(BaseSettings):
 
 # Global settings instance
 settings: Settings = Settings()  # type: ignore[call-arg]
+
+# Wei amounts derived once from the gwei settings
+GAS_PRICE_WEI = Wei(int(settings.gas_price_gwei * 10**9))
+INITIAL_FAUCET_WEI = Wei(int(settings.initial_faucet_gwei * 10**9))
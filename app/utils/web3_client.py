@@ -1,21 +1,34 @@
 """Web3 client setup and blockchain utilities."""
 
 import asyncio
-from typing import Any, Dict
-from functools import wraps
+import time
+from collections import OrderedDict
+from functools import cached_property, lru_cache, wraps
+from weakref import WeakValueDictionary
 
+from hexbytes import HexBytes
 from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3.contract import AsyncContract
+from web3.exceptions import TransactionNotFound
 from web3.middleware import async_geth_poa_middleware
+from web3.types import Nonce, TxParams, Wei
+from eth_typing import ChecksumAddress
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
-from app.settings import settings
-from app.schemas.blockchain import BlockchainAccount
+from app.settings import GAS_PRICE_WEI, settings
+from app.schemas.blockchain import BlockchainAccount, TransactionStatus
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def to_checksum(address: str) -> ChecksumAddress:
+    """Return the EIP-55 checksummed form of an address, memoized."""
+    return AsyncWeb3.to_checksum_address(address)
+
+
 def async_retry(max_retries: int = 3, delay: float = 1.0):
     """
     Decorator for retrying async functions on failure.
@@ -65,6 +78,23 @@ class Web3Client:
         # Add middleware for PoA chains using async variant for AsyncWeb3
         self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
         self._connected = False
+        # Contract bindings keyed by lower-cased token address
+        self._contracts: dict[str, AsyncContract] = {}
+        # Next faucet nonce, advanced locally after each send. User keys are
+        # handed to their owners, who may send from elsewhere, so user
+        # nonces are always read from chain
+        self._nonces: dict[str, Nonce] = {}
+        # Per-sender send locks, dropped once no send holds or awaits them
+        self._nonce_locks: WeakValueDictionary[str, asyncio.Lock] = (
+            WeakValueDictionary()
+        )
+        # Recent token balances keyed by (holder, token) checksum addresses,
+        # as (checked_at, balance, stale) in least recently used order
+        self._balances: OrderedDict[
+            tuple[str, str], tuple[float, int, bool]
+        ] = OrderedDict()
+        # Strong references to background receipt checks until they finish
+        self._receipt_tasks: set[asyncio.Task[None]] = set()
 
     async def connect(self) -> bool:
         """
@@ -90,11 +120,15 @@ class Web3Client:
             self._connected = False
             return False
 
-    def get_contract(self, address: str):
-        checksum_address = self.w3.to_checksum_address(address)
-        return self.w3.eth.contract(
-            address=checksum_address, abi=settings.erc20_abi
-        )
+    def get_contract(self, address: str) -> AsyncContract:
+        key = address.lower()
+        contract = self._contracts.get(key)
+        if contract is None:
+            contract = self.w3.eth.contract(
+                address=to_checksum(address), abi=settings.erc20_abi
+            )
+            self._contracts[key] = contract
+        return contract
 
     def create_account(self) -> BlockchainAccount:
         account: LocalAccount = Account.create()
@@ -109,19 +143,202 @@ class Web3Client:
 
     @async_retry(max_retries=3, delay=2.0)
     async def get_balance(self, address: str, token_address: str) -> int:
+        return await self._read_balance(address, token_address)
+
+    async def _read_balance(self, address: str, token_address: str) -> int:
         contract = self.get_contract(token_address)
-        checksum_address = self.w3.to_checksum_address(address)
+        checksum_address = to_checksum(address)
         balance = await contract.functions.balanceOf(checksum_address).call()
         return balance
 
+    async def get_cached_balance(
+        self, address: str, token_address: str
+    ) -> tuple[int, bool]:
+        """
+        Get a token balance, reusing values younger than balance_cache_ttl.
+
+        Returns:
+            tuple[int, bool]: The balance, and whether it is a stale cached
+            value served because the RPC call failed
+        """
+        key = (to_checksum(address), to_checksum(token_address))
+        cached = self._balances.get(key)
+        if cached is None:
+            balance = await self.get_balance(address, token_address)
+        else:
+            checked_at, balance, stale = cached
+            if time.monotonic() - checked_at < settings.balance_cache_ttl:
+                self._balances.move_to_end(key)
+                return balance, stale
+
+            # Single attempt: with a value to fall back on, retries would
+            # only delay the response during an outage
+            try:
+                balance = await self._read_balance(address, token_address)
+            except Exception as e:
+                logger.warning(
+                    "Serving stale balance",
+                    address=key[0],
+                    token=key[1],
+                    error=str(e),
+                )
+                # Hold the stale value for another TTL so an outage costs
+                # one RPC attempt per key per TTL, not one per request
+                self._store_balance(key, balance, stale=True)
+                return balance, True
+
+        self._store_balance(key, balance, stale=False)
+        return balance, False
+
+    def _store_balance(
+        self, key: tuple[str, str], balance: int, stale: bool
+    ) -> None:
+        self._balances[key] = (time.monotonic(), balance, stale)
+        self._balances.move_to_end(key)
+        if len(self._balances) > settings.balance_cache_size:
+            self._balances.popitem(last=False)
+
     @async_retry(max_retries=3, delay=2.0)
     async def get_native_balance(self, address: str) -> int:
-        checksum_address = self.w3.to_checksum_address(address)
+        checksum_address = to_checksum(address)
         balance = await self.w3.eth.get_balance(checksum_address)
         return balance
 
     @async_retry(max_retries=3, delay=2.0)
-    async def estimate_gas(self, transaction: Dict[str, Any]) -> int:
+    async def get_nonce(self, address: str) -> Nonce:
+        checksum_address = to_checksum(address)
+        async with self._nonce_lock(checksum_address):
+            return await self._cached_nonce(checksum_address)
+
+    @cached_property
+    def _faucet_address(self) -> str:
+        return Account.from_key(settings.faucet_private_key).address
+
+    def _nonce_lock(self, checksum_address: str) -> asyncio.Lock:
+        lock = self._nonce_locks.get(checksum_address)
+        if lock is None:
+            lock = self._nonce_locks[checksum_address] = asyncio.Lock()
+        return lock
+
+    async def _cached_nonce(self, checksum_address: ChecksumAddress) -> Nonce:
+        """Return the next nonce, reading it from chain only on cache miss.
+
+        Only the faucet nonce is cached. Callers must hold the nonce lock
+        for the address.
+        """
+        nonce = self._nonces.get(checksum_address)
+        if nonce is None:
+            nonce = await self.w3.eth.get_transaction_count(
+                checksum_address, "pending"
+            )
+            if checksum_address == self._faucet_address:
+                self._nonces[checksum_address] = nonce
+        return nonce
+
+    async def _send_signed(
+        self, sender: str, transaction: TxParams, private_key: str
+    ) -> HexBytes:
+        """Sign and broadcast a transaction, advancing the cached nonce.
+
+        Callers must hold the nonce lock for the sender. A failed send drops
+        the cached nonce so the next attempt re-reads it from chain.
+        """
+        signed_txn = self.w3.eth.account.sign_transaction(
+            transaction, private_key
+        )
+        try:
+            tx_hash = await self.w3.eth.send_raw_transaction(
+                signed_txn.rawTransaction
+            )
+        except Exception:
+            self._nonces.pop(sender, None)
+            raise
+        if sender == self._faucet_address:
+            self._nonces[sender] = Nonce(transaction["nonce"] + 1)
+        return tx_hash
+
+    async def _verify_receipt(self, tx_hash: HexBytes, sender: str) -> None:
+        """Wait for a transaction to be mined and check that it succeeded."""
+        tx_hash_hex = self.w3.to_hex(tx_hash)
+        try:
+            receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        except Exception:
+            # The transaction may have been dropped, leaving a nonce gap
+            self._nonces.pop(sender, None)
+            raise
+
+        if receipt["status"] != 1:
+            raise Exception(f"Transaction failed: {tx_hash_hex}")
+
+    async def _watch_receipt(self, tx_hash: HexBytes, sender: str) -> None:
+        try:
+            await self._verify_receipt(tx_hash, sender)
+        except Exception as e:
+            logger.error(
+                "Transaction not confirmed",
+                tx_hash=self.w3.to_hex(tx_hash),
+                from_address=sender,
+                error=str(e),
+            )
+
+    async def _confirm(
+        self, tx_hash: HexBytes, sender: str, wait: bool
+    ) -> None:
+        """Verify the receipt inline, or schedule it in the background."""
+        if wait:
+            await self._verify_receipt(tx_hash, sender)
+            return
+
+        task = asyncio.create_task(self._watch_receipt(tx_hash, sender))
+        self._receipt_tasks.add(task)
+        task.add_done_callback(self._receipt_tasks.discard)
+
+    async def wait_for_receipts(self, timeout: float = 10.0) -> None:
+        """
+        Let background receipt checks finish, cancelling any still running.
+
+        Args:
+            timeout: Seconds to wait before cancelling the remaining checks
+        """
+        if not self._receipt_tasks:
+            return
+
+        _, pending = await asyncio.wait(
+            set(self._receipt_tasks), timeout=timeout
+        )
+        if not pending:
+            return
+
+        logger.warning("Cancelling receipt checks", count=len(pending))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    @async_retry(max_retries=3, delay=2.0)
+    async def get_transaction_status(
+        self, tx_hash: str
+    ) -> TransactionStatus | None:
+        """
+        Look up the status of a transaction.
+
+        Returns:
+            TransactionStatus | None: None if the node does not know the hash
+        """
+        try:
+            receipt = await self.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            try:
+                await self.w3.eth.get_transaction(tx_hash)
+            except TransactionNotFound:
+                return None
+            return TransactionStatus.PENDING
+
+        if receipt["status"] == 1:
+            return TransactionStatus.SUCCESS
+        return TransactionStatus.FAILED
+
+    @async_retry(max_retries=3, delay=2.0)
+    async def estimate_gas(self, transaction: TxParams) -> int:
         try:
             gas = await self.w3.eth.estimate_gas(transaction)
             # Add 20% buffer
@@ -132,34 +349,16 @@ class Web3Client:
             )
             return settings.gas_limit
 
-    @async_retry(max_retries=3, delay=2.0)
     async def send_native_token(
-        self, from_private_key: str, to_address: str, amount_wei: int
+        self,
+        from_private_key: str,
+        to_address: str,
+        amount_wei: int,
+        wait: bool = False,
     ) -> str:
         account = self.get_account_from_key(from_private_key)
-        checksum_to = self.w3.to_checksum_address(to_address)
-
-        nonce = await self.w3.eth.get_transaction_count(account.address)
-
-        gas_price = self.w3.to_wei(settings.gas_price_gwei, "gwei")
-
-        transaction = {
-            "nonce": nonce,
-            "to": checksum_to,
-            "value": amount_wei,
-            "gas": settings.gas_limit,
-            "gasPrice": gas_price,
-            "chainId": settings.chain_id,
-        }
-
-        transaction["gas"] = await self.estimate_gas(transaction)
-
-        signed_txn = self.w3.eth.account.sign_transaction(
-            transaction, from_private_key
-        )
-
-        tx_hash = await self.w3.eth.send_raw_transaction(
-            signed_txn.rawTransaction
+        tx_hash = await self._broadcast_native_token(
+            account, from_private_key, to_address, amount_wei
         )
         tx_hash_hex = self.w3.to_hex(tx_hash)
 
@@ -171,51 +370,60 @@ class Web3Client:
             tx_hash=tx_hash_hex,
         )
 
-        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        if receipt["status"] != 1:
-            raise Exception(f"Transaction failed: {tx_hash_hex}")
+        await self._confirm(tx_hash, account.address, wait)
 
         return tx_hash_hex
 
     @async_retry(max_retries=3, delay=2.0)
-    async def transfer_erc20(
+    async def _broadcast_native_token(
         self,
-        from_private_key: str,
+        account: LocalAccount,
+        private_key: str,
         to_address: str,
-        amount: int,
-        token_address: str,
-    ) -> str:
-        account = self.get_account_from_key(from_private_key)
-        contract = self.get_contract(token_address)
-        checksum_to = self.w3.to_checksum_address(to_address)
-
-        nonce = await self.w3.eth.get_transaction_count(account.address)
+        amount_wei: int,
+    ) -> HexBytes:
+        """Build and send a native token transfer.
 
-        gas_price = self.w3.to_wei(settings.gas_price_gwei, "gwei")
+        Retried on its own so nothing after a successful broadcast can
+        cause a second one.
+        """
+        async with self._nonce_lock(account.address):
+            nonce = await self._cached_nonce(account.address)
 
-        transaction = await contract.functions.transfer(
-            checksum_to, amount
-        ).build_transaction(
-            {
-                "from": account.address,
+            transaction: TxParams = {
                 "nonce": nonce,
-                "gas": gas_price,
+                "to": to_checksum(to_address),
+                "value": Wei(amount_wei),
+                "gas": settings.gas_limit,
+                "gasPrice": GAS_PRICE_WEI,
                 "chainId": settings.chain_id,
             }
-        )
 
-        transaction["gas"] = await self.estimate_gas(transaction)
+            transaction["gas"] = await self.estimate_gas(transaction)
 
-        signed_txn = self.w3.eth.account.sign_transaction(
-            transaction, from_private_key
-        )
+            return await self._send_signed(
+                account.address, transaction, private_key
+            )
 
-        tx_hash = await self.w3.eth.send_raw_transaction(
-            signed_txn.rawTransaction
+    async def transfer_erc20(
+        self,
+        from_private_key: str,
+        to_address: str,
+        amount: int,
+        token_address: str,
+        wait: bool = False,
+    ) -> str:
+        account = self.get_account_from_key(from_private_key)
+        tx_hash = await self._broadcast_erc20(
+            account, from_private_key, to_address, amount, token_address
         )
         tx_hash_hex = self.w3.to_hex(tx_hash)
 
+        # Both balances are about to change
+        checksum_token = to_checksum(token_address)
+        self._balances.pop((account.address, checksum_token), None)
+        self._balances.pop((to_checksum(to_address), checksum_token), None)
+
         logger.info(
             "ERC20 transfer sent",
             from_address=account.address,
@@ -225,14 +433,43 @@ class Web3Client:
             tx_hash=tx_hash_hex,
         )
 
-        # Wait for transaction receipt
-        receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
-
-        if receipt["status"] != 1:
-            raise Exception(f"Transaction failed: {tx_hash_hex}")
+        await self._confirm(tx_hash, account.address, wait)
 
         return tx_hash_hex
 
+    @async_retry(max_retries=3, delay=2.0)
+    async def _broadcast_erc20(
+        self,
+        account: LocalAccount,
+        private_key: str,
+        to_address: str,
+        amount: int,
+        token_address: str,
+    ) -> HexBytes:
+        """Build and send an ERC20 transfer, retried like its native twin."""
+        contract = self.get_contract(token_address)
+
+        async with self._nonce_lock(account.address):
+            nonce = await self._cached_nonce(account.address)
+
+            transaction = await contract.functions.transfer(
+                to_checksum(to_address), amount
+            ).build_transaction(
+                {
+                    "from": account.address,
+                    "nonce": nonce,
+                    "gas": settings.gas_limit,
+                    "gasPrice": GAS_PRICE_WEI,
+                    "chainId": settings.chain_id,
+                }
+            )
+
+            transaction["gas"] = await self.estimate_gas(transaction)
+
+            return await self._send_signed(
+                account.address, transaction, private_key
+            )
+
 
 # Global Web3 client instance
 web3_client = Web3Client()
@@ -1,79 +1,334 @@
 """Test suite for blockchain banking API."""
 
+import json
+import logging
+import uuid
+from typing import Any, AsyncIterator
+
+import orjson
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+import structlog
+from asgi_lifespan import LifespanManager
+from fastapi import FastAPI
+from httpx import URL, ASGITransport, AsyncClient
+from web3.exceptions import TransactionNotFound
 
-from app.main import app
+from app.database import get_db
+from app.main import create_app, health_check
+from app.settings import settings
 from app.utils.web3_client import web3_client
 
+_BASE_URL = URL("http://test")
+
+
+@pytest.fixture(scope="session")
+def app_instance() -> FastAPI:
+    """Application built once per session, so each xdist worker owns one."""
+    return create_app()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(
+    app_instance: FastAPI, mock_web3_connect
+) -> AsyncIterator[AsyncClient]:
+    """Single HTTP client shared by every test in the session.
+
+    The app's lifespan startup runs once, before the first test.
+    """
+    async with LifespanManager(app_instance) as manager:
+        # Built once instead of letting AsyncClient(app=...) wrap the app
+        transport = ASGITransport(
+            app=manager.app, raise_app_exceptions=True
+        )
+        async with AsyncClient(
+            transport=transport, base_url=_BASE_URL
+        ) as client:
+            yield client
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _warmup(client: AsyncClient) -> None:
+    """Route one request through the app before any test is timed."""
+    await client.get("/")
+
+
+def _unique_name(prefix: str) -> str:
+    """Account name that cannot collide across reruns or xdist workers."""
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+
+async def _mock_send_native_token(*args, **kwargs):
+    return "0xtestfaucettxhash"
+
+
+async def _mock_connect() -> bool:
+    return True
+
+
+def _tx_hash(i: int) -> str:
+    return f"0x{i:064x}"
+
+
+_MINED_TX = _tx_hash(1)
+_REVERTED_TX = _tx_hash(2)
+_PENDING_TX = _tx_hash(3)
+
+
+class _FakeEth:
+    """Node stub that knows one mined, one reverted and one pending hash."""
 
-@pytest.fixture(autouse=True)
-def mock_send_native_token(monkeypatch):
+    _receipts = {_MINED_TX: {"status": 1}, _REVERTED_TX: {"status": 0}}
+
+    async def get_transaction_receipt(self, tx_hash: str) -> dict[str, int]:
+        if tx_hash not in self._receipts:
+            raise TransactionNotFound(tx_hash)
+        return self._receipts[tx_hash]
+
+    async def get_transaction(self, tx_hash: str) -> dict[str, str]:
+        if tx_hash != _PENDING_TX:
+            raise TransactionNotFound(tx_hash)
+        return {"hash": tx_hash}
+
+
+class _EmptyResult:
+    def scalar_one_or_none(self) -> None:
+        return None
+
+
+class _EmptySession:
+    """Stand-in session whose queries never find a row."""
+
+    async def execute(self, *args: Any, **kwargs: Any) -> _EmptyResult:
+        return _EmptyResult()
+
+
+async def _get_empty_db() -> AsyncIterator[_EmptySession]:
+    yield _EmptySession()
+
+
+@pytest.fixture
+def empty_db(app_instance: FastAPI):
+    """Serve requests from a session with no accounts, bypassing the DB."""
+    app_instance.dependency_overrides[get_db] = _get_empty_db
+    yield
+    app_instance.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def fake_node(monkeypatch):
+    """Answer transaction lookups from a fixed set of hashes."""
+    monkeypatch.setattr(web3_client.w3, "eth", _FakeEth())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_send_native_token():
     """Mock Web3 native token transfer to avoid network calls."""
+    original = web3_client.send_native_token
+    web3_client.send_native_token = _mock_send_native_token
+    yield _mock_send_native_token
+    web3_client.send_native_token = original
+
+
+@pytest.fixture(scope="session")
+def mock_web3_connect():
+    """Mock the lifespan blockchain connection check."""
+    original = web3_client.connect
+    web3_client.connect = _mock_connect
+    yield _mock_connect
+    web3_client.connect = original
+
+
+async def test_root_endpoint():
+    """Test root endpoint returns health status."""
+    # Pure payload check, so call the handler without the HTTP stack
+    assert (await health_check())["status"] == "healthy"
+
+
+async def test_root_endpoint_http(client: AsyncClient):
+    """Smoke test the root endpoint over HTTP."""
+    response = await client.get("/")
+    assert response.status_code == 200
+    # Compact bytes show the ORJSONResponse default is in effect
+    assert response.content == b'{"status":"healthy"}'
+
+
+async def test_account_lifecycle(client: AsyncClient):
+    """Test account creation, then that creating it again fails."""
+    name = _unique_name("test_user")
+
+    # Create account
+    response = await client.post("/api/create_account", json={"name": name})
+    assert response.status_code == 201
+    data = orjson.loads(response.content)
+    assert data["name"] == name
+    assert "address" in data
+    assert "private_key" in data
+    assert data["address"].startswith("0x")
+    assert data["faucet_tx_hash"] == "0xtestfaucettxhash"
+
+    # Try to create duplicate
+    response = await client.post("/api/create_account", json={"name": name})
+    assert response.status_code == 409
+
+
+async def test_get_balance_nonexistent_account(client: AsyncClient, empty_db):
+    """Test getting balance for nonexistent account."""
+    response = await client.get(
+        "/api/get_balance",
+        params={
+            "name": "nonexistent",
+            "token": "USDC",
+        },
+    )
+    assert response.status_code == 404
 
-    async def _mock_send_native_token(*args, **kwargs):
-        return "0xtestfaucettxhash"
+
+async def test_get_balance_beyond_64_bits(client: AsyncClient, monkeypatch):
+    """Test that balances of 2**64 wei or more are returned intact."""
+    name = _unique_name("whale")
+    response = await client.post("/api/create_account", json={"name": name})
+    assert response.status_code == 201
+
+    async def _mock_get_cached_balance(
+        address: str, token_address: str
+    ) -> tuple[int, bool]:
+        return 10**20, False
 
     monkeypatch.setattr(
-        web3_client,
-        "send_native_token",
-        _mock_send_native_token,
-        raising=True,
+        web3_client, "get_cached_balance", _mock_get_cached_balance
+    )
+    response = await client.get(
+        "/api/get_balance", params={"name": name, "token": "USDC"}
     )
+    assert response.status_code == 200
+    assert json.loads(response.content)["balance"] == 10**20
 
-    return _mock_send_native_token
 
+async def test_rate_limit_exceeded():
+    """Test that requests beyond the default limit are rejected with 429."""
+    limited_app = create_app(default_limits=["1/minute"])
+    limited_app.dependency_overrides[get_db] = _get_empty_db
+    transport = ASGITransport(app=limited_app)
+    async with AsyncClient(transport=transport, base_url=_BASE_URL) as client:
+        params = {"name": "nonexistent", "token": "USDC"}
+        response = await client.get("/api/get_balance", params=params)
+        assert response.status_code == 404
 
-@pytest.mark.asyncio
-async def test_root_endpoint():
-    """Test root endpoint returns health status."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/get_balance", params=params)
+        assert response.status_code == 429
+        assert orjson.loads(response.content) == {
+            "detail": "Too Many Requests"
+        }
+        assert response.headers["Retry-After"] == "60"
+
+        # The health check is exempt
         response = await client.get("/")
         assert response.status_code == 200
-        assert response.json()["status"] == "healthy"
 
 
-@pytest.mark.asyncio
-async def test_create_account():
-    """Test account creation endpoint."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+@pytest.mark.parametrize(
+    "tx_hash, expected",
+    [
+        (_PENDING_TX, "pending"),
+        (_MINED_TX, "success"),
+        (_REVERTED_TX, "failed"),
+    ],
+)
+async def test_transaction_status(
+    client: AsyncClient, empty_db, fake_node, tx_hash: str, expected: str
+):
+    """Test that receipts map to pending, success and failed."""
+    response = await client.get(f"/api/tx/{tx_hash}")
+    assert response.status_code == 200
+    assert orjson.loads(response.content) == {
+        "tx_hash": tx_hash,
+        "status": expected,
+    }
+
+
+async def test_transaction_status_unknown_hash(
+    client: AsyncClient, empty_db, fake_node
+):
+    """Test that a hash the node has never seen returns 404."""
+    response = await client.get(f"/api/tx/{_tx_hash(4)}")
+    assert response.status_code == 404
+
+
+async def test_transaction_status_invalid_hash(client: AsyncClient, empty_db):
+    """Test that a malformed hash is rejected before reaching the node."""
+    response = await client.get("/api/tx/0x1234")
+    assert response.status_code == 422
+
+
+async def test_transfer_waits_only_when_asked(
+    client: AsyncClient, monkeypatch
+):
+    """Test that transfers are submitted by default and mined with wait."""
+    sender = _unique_name("sender")
+    recipient = _unique_name("recipient")
+    for name in (sender, recipient):
         response = await client.post(
-            "/api/create_account", json={"name": "test_user"}
+            "/api/create_account", json={"name": name}
         )
         assert response.status_code == 201
-        data = response.json()
-        assert data["name"] == "test_user"
-        assert "address" in data
-        assert "private_key" in data
-        assert data["address"].startswith("0x")
-        assert data["faucet_tx_hash"] == "0xtestfaucettxhash"
-
-
-@pytest.mark.asyncio
-async def test_create_duplicate_account():
-    """Test that creating duplicate account fails."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Create first account
-        await client.post(
-            "/api/create_account", json={"name": "duplicate_user"}
-        )
 
-        # Try to create duplicate
-        response = await client.post(
-            "/api/create_account", json={"name": "duplicate_user"}
-        )
-        assert response.status_code == 409
+    waits: list[bool] = []
 
+    async def _mock_get_balance(address: str, token_address: str) -> int:
+        return 10**21
 
-@pytest.mark.asyncio
-async def test_get_balance_nonexistent_account():
-    """Test getting balance for nonexistent account."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        response = await client.get(
-            "/api/get_balance",
-            params={
-                "name": "nonexistent",
-                "token": "USDC",
-            },
-        )
+    async def _mock_transfer_erc20(**kwargs: Any) -> str:
+        waits.append(kwargs["wait"])
+        return "0xtesttransfertxhash"
+
+    monkeypatch.setattr(web3_client, "get_balance", _mock_get_balance)
+    monkeypatch.setattr(web3_client, "transfer_erc20", _mock_transfer_erc20)
+
+    body = {
+        "from_name": sender,
+        "to_name": recipient,
+        # Above 2**64, like most wei amounts
+        "amount": 10**20,
+        "token": "USDC",
+    }
+    response = await client.post("/api/transfer", json=body)
+    assert response.status_code == 200
+    # orjson would decode the amount as a float
+    data = json.loads(response.content)
+    assert data["amount"] == 10**20
+    assert data["tx_hash"] == "0xtesttransfertxhash"
+    assert data["message"] == "Transfer submitted"
+
+    response = await client.post(
+        "/api/transfer", params={"wait": "true"}, json=body
+    )
+    assert response.status_code == 200
+    assert orjson.loads(response.content)["message"] == "Transfer successful"
+
+    assert waits == [False, True]
+
+
+def test_log_renders_amounts_beyond_64_bits(caplog):
+    """Test that wei amounts too large for orjson are still logged."""
+    with caplog.at_level(logging.INFO):
+        structlog.get_logger("test").info("Transfer", amount=10**20)
+    assert "100000000000000000000" in caplog.text
+
+
+async def test_rate_limit_storage_unreachable(monkeypatch):
+    """Test that a Redis outage falls back to in-memory limits, not 500s."""
+    # Nothing listens on port 1, so every Redis call is refused
+    monkeypatch.setattr(
+        settings, "rate_limit_storage_uri", "redis://127.0.0.1:1"
+    )
+    limited_app = create_app(default_limits=["1/minute"])
+    limited_app.dependency_overrides[get_db] = _get_empty_db
+    transport = ASGITransport(app=limited_app)
+    async with AsyncClient(transport=transport, base_url=_BASE_URL) as client:
+        params = {"name": "nonexistent", "token": "USDC"}
+        response = await client.get("/api/get_balance", params=params)
         assert response.status_code == 404
+
+        response = await client.get("/api/get_balance", params=params)
+        assert response.status_code == 429
@@ -0,0 +1,21 @@
+"""Tests for request schema validation."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.user import UserCreate
+
+
+@pytest.mark.parametrize("name", ["alice", "a_b-c", "_bob_", "42"])
+def test_user_name_accepted(name: str):
+    """Test that ASCII alphanumerics, hyphens and underscores pass."""
+    assert UserCreate(name=name).name == name
+
+
+@pytest.mark.parametrize(
+    "name", ["___", "-", "_-_", "ålice", "名前", "a b", "a" * 98 + "!"]
+)
+def test_user_name_rejected(name: str):
+    """Test that separator-only and non-ASCII names are rejected."""
+    with pytest.raises(ValidationError):
+        UserCreate(name=name)
@@ -0,0 +1,241 @@
+"""Tests for the Web3 client caches, run against a fake node."""
+
+import asyncio
+import time
+from types import MethodType, SimpleNamespace
+from typing import Any
+
+import pytest
+from eth_account import Account
+from hexbytes import HexBytes
+from web3.exceptions import TimeExhausted
+
+from app.settings import settings
+from app.utils.web3_client import Web3Client
+
+_TOKEN = "0x" + "11" * 20
+_SENDER_KEY = "0x" + "01" * 32
+_SENDER = Account.from_key(_SENDER_KEY).address
+
+
+def _address(i: int) -> str:
+    return f"0x{i:040x}"
+
+
+class _BalanceReads:
+    """Stand-in for Web3Client._read_balance that counts calls."""
+
+    def __init__(self, balance: int = 5):
+        self.balance = balance
+        self.fail = False
+        self.calls = 0
+
+    async def __call__(self, address: str, token_address: str) -> int:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("node unreachable")
+        return self.balance
+
+
+@pytest.fixture
+def client() -> Web3Client:
+    return Web3Client()
+
+
+@pytest.fixture
+def reads(client: Web3Client, monkeypatch) -> _BalanceReads:
+    reads = _BalanceReads()
+    monkeypatch.setattr(client, "_read_balance", reads)
+    return reads
+
+
+def _expire(client: Web3Client) -> None:
+    for key, (_, balance, stale) in client._balances.items():
+        client._balances[key] = (
+            time.monotonic() - settings.balance_cache_ttl - 1,
+            balance,
+            stale,
+        )
+
+
+async def test_cached_balance_reused_within_ttl(client, reads):
+    """Test that a fresh balance is served without another RPC call."""
+    assert await client.get_cached_balance(_address(1), _TOKEN) == (5, False)
+    assert await client.get_cached_balance(_address(1), _TOKEN) == (5, False)
+    assert reads.calls == 1
+
+
+async def test_stale_balance_served_after_one_attempt(client, reads):
+    """Test that an outage costs one RPC attempt per TTL, not retries."""
+    await client.get_cached_balance(_address(1), _TOKEN)
+    _expire(client)
+    reads.fail = True
+
+    started = time.monotonic()
+    assert await client.get_cached_balance(_address(1), _TOKEN) == (5, True)
+    assert time.monotonic() - started < 1
+    assert reads.calls == 2
+
+    # The stale value is held for another TTL without touching the node
+    assert await client.get_cached_balance(_address(1), _TOKEN) == (5, True)
+    assert reads.calls == 2
+
+    # Once the node is back, the next expiry refreshes the balance
+    _expire(client)
+    reads.fail = False
+    reads.balance = 7
+    assert await client.get_cached_balance(_address(1), _TOKEN) == (7, False)
+
+
+async def test_balance_cache_evicts_least_recently_used(
+    client, reads, monkeypatch
+):
+    """Test that the balance cache never holds more than its size."""
+    monkeypatch.setattr(settings, "balance_cache_size", 2)
+    await client.get_cached_balance(_address(1), _TOKEN)
+    await client.get_cached_balance(_address(2), _TOKEN)
+    # Touch the first entry so the second is the least recently used
+    await client.get_cached_balance(_address(1), _TOKEN)
+    await client.get_cached_balance(_address(3), _TOKEN)
+
+    holders = [holder for holder, _ in client._balances]
+    assert len(holders) == 2
+    assert holders[0].lower() == _address(1)
+    assert holders[1].lower() == _address(3)
+
+
+class _StalledEth:
+    """Node stub whose receipts never arrive."""
+
+    async def wait_for_transaction_receipt(self, tx_hash: bytes) -> None:
+        await asyncio.Event().wait()
+
+
+async def test_wait_for_receipts_cancels_unfinished_checks(
+    client, monkeypatch
+):
+    """Test that shutdown does not leave receipt checks running."""
+    monkeypatch.setattr(client.w3, "eth", _StalledEth())
+    await client._confirm(b"\x01" * 32, _address(1), wait=False)
+    (task,) = client._receipt_tasks
+
+    await client.wait_for_receipts(timeout=0.01)
+
+    assert task.cancelled()
+    assert not client._receipt_tasks
+
+
+class _FakeNode:
+    """Node stub for w3.eth that records the nonce of every broadcast."""
+
+    def __init__(self, chain_nonce: int = 7):
+        self.chain_nonce = chain_nonce
+        self.nonce_reads = 0
+        self.sent_nonces: list[int] = []
+        self.fail_sends = False
+        self.receipt_error: Exception | None = None
+        self.account = self
+
+    def sign_transaction(
+        self, transaction: dict[str, Any], private_key: str
+    ) -> SimpleNamespace:
+        return SimpleNamespace(rawTransaction=transaction["nonce"])
+
+    async def get_transaction_count(self, address: str, block: str) -> int:
+        self.nonce_reads += 1
+        # Yield so concurrent senders interleave as they would over HTTP
+        await asyncio.sleep(0)
+        return self.chain_nonce
+
+    async def estimate_gas(self, transaction: dict[str, Any]) -> int:
+        return 21000
+
+    async def send_raw_transaction(self, nonce: int) -> HexBytes:
+        await asyncio.sleep(0)
+        if self.fail_sends:
+            raise ConnectionError("broadcast failed")
+        self.sent_nonces.append(nonce)
+        return HexBytes(nonce.to_bytes(32, "big"))
+
+    async def wait_for_transaction_receipt(
+        self, tx_hash: HexBytes
+    ) -> dict[str, int]:
+        if self.receipt_error is not None:
+            raise self.receipt_error
+        return {"status": 1}
+
+
+@pytest.fixture
+def node(client: Web3Client, monkeypatch) -> _FakeNode:
+    node = _FakeNode()
+    monkeypatch.setattr(client.w3, "eth", node)
+    # Only the faucet nonce is cached; send as the faucet
+    monkeypatch.setattr(client, "_faucet_address", _SENDER)
+    return node
+
+
+async def _send(
+    client: Web3Client, wait: bool = False, key: str = _SENDER_KEY
+) -> str:
+    return await client.send_native_token(key, _address(1), 1, wait=wait)
+
+
+async def test_concurrent_sends_get_consecutive_nonces(client, node):
+    """Test that two concurrent sends use nonces N and N + 1."""
+    await asyncio.gather(_send(client), _send(client))
+    await client.wait_for_receipts()
+
+    assert sorted(node.sent_nonces) == [7, 8]
+    assert node.nonce_reads == 1
+
+
+async def test_failed_broadcast_rereads_nonce(client, node, monkeypatch):
+    """Test that a failed broadcast makes the next send re-read the nonce."""
+    # Bypass async_retry so the failure surfaces without the retry sleeps
+    monkeypatch.setattr(
+        client,
+        "_broadcast_native_token",
+        MethodType(Web3Client._broadcast_native_token.__wrapped__, client),
+    )
+    await _send(client)
+    node.fail_sends = True
+    with pytest.raises(ConnectionError):
+        await _send(client)
+    assert _SENDER not in client._nonces
+
+    # Another sender used nonce 8 in the meantime
+    node.chain_nonce = 9
+    node.fail_sends = False
+    await _send(client)
+    await client.wait_for_receipts()
+
+    assert node.sent_nonces == [7, 9]
+    assert node.nonce_reads == 2
+
+
+async def test_receipt_timeout_rereads_nonce(client, node):
+    """Test that a receipt that never arrives drops the cached nonce."""
+    node.receipt_error = TimeExhausted("no receipt")
+    with pytest.raises(TimeExhausted):
+        await _send(client, wait=True)
+    assert _SENDER not in client._nonces
+
+    # The receipt failure did not rebroadcast, and the dropped transaction
+    # left nonce 7 unused on chain
+    node.receipt_error = None
+    await _send(client, wait=True)
+
+    assert node.sent_nonces == [7, 7]
+    assert node.nonce_reads == 2
+
+
+async def test_user_nonce_read_from_chain_every_send(client, node):
+    """Test that user nonces are never cached, nor their locks kept."""
+    user_key = "0x" + "02" * 32
+    await _send(client, key=user_key)
+    await _send(client, key=user_key)
+    await client.wait_for_receipts()
+
+    assert node.nonce_reads == 2
+    assert not client._nonces
+    assert not client._nonce_locks